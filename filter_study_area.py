@@ -2,16 +2,29 @@
 """filter_study_area.py - Filter coal data to Crawford + surrounding counties (no pandas)"""
 
 import csv
+import io
 import os
-from collections import defaultdict
+from collections import Counter
+from concurrent.futures import ProcessPoolExecutor
+from contextlib import redirect_stdout
+from functools import partial
 
 # Study area county names
 STUDY_COUNTIES = {'CRAWFORD', 'CLARK', 'LAWRENCE', 'JASPER', 'CUMBERLAND', 'RICHLAND'}
 
+# Raw county spellings known to map to a study county, seeded with the
+# usual casings so matching rows never need normalizing
+STUDY_COUNTY_SPELLINGS = {variant: county
+                          for county in STUDY_COUNTIES
+                          for variant in (county, county.title(), county.lower())}
+
 # Approximate bounding box for study area (decimal degrees)
 MIN_LAT, MAX_LAT = 38.5, 39.6
 MIN_LON, MAX_LON = -88.3, -87.3
 
+# Large file buffers cut read/write syscalls on the multi-MB source CSVs
+CSV_BUFFER_SIZE = 1 << 20
+
 def find_column(headers, patterns):
     """Find column index matching any pattern"""
     for i, h in enumerate(headers):
@@ -21,9 +34,99 @@ def find_column(headers, patterns):
                 return i
     return None
 
+def make_row_writer(outfile):
+    """Return a writerow function that skips csv quoting for plain rows
+
+    Rows whose cells hold no delimiter, quote or line break are joined and
+    written directly; anything else falls back to csv.writer. Output is
+    identical to csv.writer with the default dialect.
+    """
+    writer = csv.writer(outfile)
+    write = outfile.write
+
+    def writerow(row):
+        line = ','.join(row)
+        if (not line or '"' in line or '\n' in line or '\r' in line
+                or line.count(',') != len(row) - 1):
+            writer.writerow(row)
+        else:
+            write(line + '\r\n')
+
+    return writerow
+
+def call_with_log(func, item):
+    """Call func(item) with stdout captured; return (result, log output)"""
+    log = io.StringIO()
+    with redirect_stdout(log):
+        result = func(item)
+    return result, log.getvalue()
+
+def map_with_logs(func, items):
+    """Run func over independent items in parallel and return the results
+
+    Each worker buffers its own log, and the logs are printed in item
+    order, so the output stays grouped per item instead of interleaving.
+    """
+    items = list(items)
+    results = []
+    with ProcessPoolExecutor(max_workers=len(items)) as executor:
+        for result, log in executor.map(partial(call_with_log, func), items):
+            print(log, end='')
+            results.append(result)
+    return results
+
+def filter_rows(reader, writerow, county_idx, lat_idx, lon_idx):
+    """Write the study-area rows from reader; return (total, kept, county_counts)
+
+    county_counts tallies kept rows per study county when filtering by
+    county name, and is empty for the coordinate filter.
+    """
+    # Which filter applies depends only on the headers, so pick it once
+    # instead of re-testing it for every row.
+    county_counts = Counter()
+    total_rows = 0
+    kept_rows = 0
+
+    if county_idx is not None:
+        # County filter. Each raw spelling maps straight to its study
+        # county ('' when outside the study area), so a row costs one
+        # dict lookup; only unseen spellings pay for upper()/strip().
+        county_lookup = dict(STUDY_COUNTY_SPELLINGS)
+        for row in reader:
+            total_rows += 1
+            raw = row[county_idx]
+            county = county_lookup.get(raw)
+            if county is None:
+                county = raw.upper().strip()
+                if county not in STUDY_COUNTIES:
+                    county = ''
+                county_lookup[raw] = county
+            if county:
+                county_counts[county] += 1
+                kept_rows += 1
+                writerow(row)
+
+    elif lat_idx is not None and lon_idx is not None:
+        # Fall back to coordinate filter if there is no county column
+        for row in reader:
+            total_rows += 1
+            try:
+                lat = float(row[lat_idx])
+                lon = float(row[lon_idx])
+            except (ValueError, IndexError):
+                continue
+            if MIN_LAT <= lat <= MAX_LAT and MIN_LON <= lon <= MAX_LON:
+                kept_rows += 1
+                writerow(row)
+
+    else:
+        total_rows = sum(1 for _ in reader)
+
+    return total_rows, kept_rows, county_counts
+
 def filter_csv(input_path, output_path):
     """Filter CSV to study area by county name or coordinates"""
-    with open(input_path, 'r', newline='') as infile:
+    with open(input_path, 'r', newline='', buffering=CSV_BUFFER_SIZE) as infile:
         reader = csv.reader(infile)
         headers = next(reader)
 
@@ -37,70 +140,55 @@ def filter_csv(input_path, output_path):
         print(f"  Lat col: {headers[lat_idx] if lat_idx is not None else 'N/A'}")
         print(f"  Lon col: {headers[lon_idx] if lon_idx is not None else 'N/A'}")
 
-        # Read and filter rows
-        filtered_rows = []
-        county_counts = defaultdict(int)
-        total_rows = 0
-
-        for row in reader:
-            total_rows += 1
-            keep = False
-
-            # Try county filter first
-            if county_idx is not None:
-                county = row[county_idx].upper().strip()
-                if county in STUDY_COUNTIES:
-                    keep = True
-                    county_counts[county] += 1
-
-            # Fall back to coordinate filter if no county match
-            elif lat_idx is not None and lon_idx is not None:
-                try:
-                    lat = float(row[lat_idx])
-                    lon = float(row[lon_idx])
-                    if MIN_LAT <= lat <= MAX_LAT and MIN_LON <= lon <= MAX_LON:
-                        keep = True
-                except (ValueError, IndexError):
-                    pass
-
-            if keep:
-                filtered_rows.append(row)
-
-        print(f"  Total rows: {total_rows}")
-        print(f"  Filtered rows: {len(filtered_rows)}")
-
-        if county_counts:
-            print("  Records by county:")
-            for county in sorted(county_counts.keys()):
-                print(f"    {county}: {county_counts[county]}")
-
-        # Write filtered output
-        with open(output_path, 'w', newline='') as outfile:
-            writer = csv.writer(outfile)
-            writer.writerow(headers)
-            writer.writerows(filtered_rows)
-
-        return len(filtered_rows)
-
-# Main execution
-print("=" * 60)
-print("FILTERING DRILL HOLE DATA TO STUDY AREA")
-print("=" * 60)
-print(f"Study counties: {sorted(STUDY_COUNTIES)}")
-print(f"Bounding box: Lat {MIN_LAT}-{MAX_LAT}, Lon {MIN_LON}-{MAX_LON}")
-
-for filename in ['major-coals-all.csv', 'minor-coals-all.csv']:
+        # Kept rows are written as they are read, so memory does not grow
+        # with the size of the filtered output. The output is only created
+        # once the header has been read, and a failed scan removes the file
+        # it created so no partial output is left behind.
+        with open(output_path, 'w', newline='', buffering=CSV_BUFFER_SIZE) as outfile:
+            try:
+                writerow = make_row_writer(outfile)
+                writerow(headers)
+                total_rows, kept_rows, county_counts = filter_rows(
+                    reader, writerow, county_idx, lat_idx, lon_idx)
+            except BaseException:
+                outfile.close()
+                os.remove(output_path)
+                raise
+
+    print(f"  Total rows: {total_rows}")
+    print(f"  Filtered rows: {kept_rows}")
+
+    if county_counts:
+        print("  Records by county:")
+        for county in sorted(county_counts.keys()):
+            print(f"    {county}: {county_counts[county]}")
+
+    return kept_rows
+
+def filter_one(filename):
+    """Filter one data/csv file to the study area"""
     input_path = f'data/csv/{filename}'
     output_name = filename.replace('.csv', '-study-area.csv')
     output_path = f'data/csv/{output_name}'
 
     print(f"\n{filename}:")
     try:
-        count = filter_csv(input_path, output_path)
+        filter_csv(input_path, output_path)
         print(f"  -> Saved to {output_name}")
     except Exception as e:
         print(f"  Error: {e}")
 
-print("\n" + "=" * 60)
-print("COMPLETE")
-print("=" * 60)
+# Main execution
+if __name__ == '__main__':
+    print("=" * 60)
+    print("FILTERING DRILL HOLE DATA TO STUDY AREA")
+    print("=" * 60)
+    print(f"Study counties: {sorted(STUDY_COUNTIES)}")
+    print(f"Bounding box: Lat {MIN_LAT}-{MAX_LAT}, Lon {MIN_LON}-{MAX_LON}")
+
+    # The files are independent, so filter them in parallel
+    map_with_logs(filter_one, ['major-coals-all.csv', 'minor-coals-all.csv'])
+
+    print("\n" + "=" * 60)
+    print("COMPLETE")
+    print("=" * 60)
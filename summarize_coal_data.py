@@ -3,218 +3,268 @@
 
 import csv
 import os
-from collections import defaultdict
-
+import re
+from array import array
+from functools import lru_cache
+from typing import NamedTuple
+
+import numpy as np
+
+from filter_study_area import CSV_BUFFER_SIZE, make_row_writer
+
+# Study-area inputs and the combined output
+MAJOR_CSV = 'data/csv/major-coals-all-study-area.csv'
+MINOR_CSV = 'data/csv/minor-coals-all-study-area.csv'
+COMBINED_CSV = 'data/csv/all-coals-study-area-combined.csv'
+
+# Seam name -> (top, thickness) header patterns
+MAJOR_SEAMS = {
+    'Danville': ('top_danville', 'thick_danville'),
+    'Herrin': ('top_herrin', 'thick_herrin'),
+    'Springfield': ('top_spring', 'thick_spring'),
+}
+MINOR_SEAMS = {
+    'Jamestown': ('top_jtown', 'thick_jtown'),
+    'Colchester': ('top_colch', 'thick_colch'),
+    'Seelyville': ('top_seely', 'thick_seely'),
+    'Dekoven': ('top_dekoven', 'thick_dekoven'),
+    'Davis': ('top_davis', 'thick_davis'),
+}
+
+# Combined headers, and the columns taken from each source
+COMBINED_HEADERS = [
+    'IDS', 'COUNTY_NAME', 'LONGITUDE', 'LATITUDE', 'SURFELV', 'WELL_TYPE', 'LOG_TYPE',
+    'TOP_DANVILLE', 'THICK_DANVILLE',
+    'TOP_HERRIN', 'THICK_HERRIN',
+    'TOP_SPRING', 'THICK_SPRING',
+    'TOP_COLCH', 'THICK_COLCH',
+    'TOP_SEELY', 'THICK_SEELY'
+]
+MAJOR_COMBINED_COLS = COMBINED_HEADERS[:13]
+MINOR_COMBINED_COLS = COMBINED_HEADERS[13:]
+
+# Plain decimal/scientific numbers; anything else is treated as missing (NaN)
+NAN = float('nan')
+FLOAT_RE = re.compile(r'[+-]?(?:\d+\.?\d*|\.\d+)(?:[eE][+-]?\d+)?')
+
+@lru_cache(maxsize=4096)
 def parse_float(val):
-    """Parse a value as float, return None if empty or invalid"""
-    if val is None or val == '' or val.strip() == '':
-        return None
-    try:
-        return float(val)
-    except (ValueError, TypeError):
-        return None
-
-def find_column(headers, patterns):
-    """Find column index matching any pattern"""
+    """Parse a value as float, return NaN if empty or invalid
+
+    Depth/thickness cells repeat heavily across holes, so results are
+    memoized. The study-area files hold under 2,000 distinct seam cells,
+    so the bounded cache keeps all of them while memory stays fixed on
+    larger inputs. Cells are matched against FLOAT_RE first so bad values
+    never raise.
+    """
+    if val is None:
+        return NAN
+    val = val.strip()
+    if not FLOAT_RE.fullmatch(val):
+        return NAN
+    return float(val)
+
+def column_stats(values):
+    """Return (count, min, max, mean) of the non-NaN entries of a float array"""
+    valid = values[~np.isnan(values)]
+    if not valid.size:
+        return 0, NAN, NAN, NAN
+    return valid.size, valid.min(), valid.max(), valid.mean()
+
+def resolve_columns(headers, patterns):
+    """Map each pattern to the index of the first header containing it
+
+    Headers are lowercased once and matched in a single pass, instead of
+    rescanning the header list for every column lookup.
+    """
+    found = dict.fromkeys(patterns)
     for i, h in enumerate(headers):
         h_lower = h.lower()
         for pattern in patterns:
-            if pattern in h_lower:
-                return i
-    return None
+            if found[pattern] is None and pattern in h_lower:
+                found[pattern] = i
+    return found
+
+def collect_seam_values(reader, county_idx, seams, keep_positions=()):
+    """Scan rows once, parsing every seam's depth/thickness cells
+
+    Values are appended to compact array('d') buffers (NaN marks a missing
+    cell) rather than lists of Python floats, then exposed as NumPy arrays.
+    The raw cells at ``keep_positions`` (None for a missing column, kept as
+    a blank) are also collected per row.
+
+    Returns (counties, values, cells): counties holds each row's county
+    name, values maps seam name -> (depths, thicknesses) float64 arrays
+    aligned with it, and cells holds each row's kept cells.
+    """
+    columns = {seam_name: (array('d'), array('d')) for seam_name in seams}
+
+    # Hoist per-seam lookups out of the row loop
+    plan = [(indices['top'], indices['thick'],
+             columns[seam_name][0].append, columns[seam_name][1].append)
+            for seam_name, indices in seams.items()]
+    pf = parse_float
+
+    counties = []
+    add_county = counties.append
+    cells = []
+    add_cells = cells.append
+    for row in reader:
+        add_county(row[county_idx] if county_idx is not None else 'Unknown')
+        if keep_positions:
+            add_cells([row[i] if i is not None else '' for i in keep_positions])
+
+        for top_idx, thick_idx, add_depth, add_thick in plan:
+            # Most holes do not log every seam: skip blank seam cells
+            # before paying for float parsing
+            top_cell = row[top_idx] if top_idx is not None else ''
+            thick_cell = row[thick_idx] if thick_idx is not None else ''
+            if not (top_cell or thick_cell):
+                add_depth(NAN)
+                add_thick(NAN)
+                continue
+
+            add_depth(pf(top_cell))
+            add_thick(pf(thick_cell))
+
+    values = {seam_name: (np.frombuffer(depths, dtype=np.float64),
+                          np.frombuffer(thicknesses, dtype=np.float64))
+              for seam_name, (depths, thicknesses) in columns.items()}
+    return np.array(counties), values, cells
+
+class CoalScan(NamedTuple):
+    """Everything taken from one pass over a coal CSV"""
+    headers: list[str]
+    seams: dict            # seam name -> {'top': index, 'thick': index}
+    counties: np.ndarray   # county name per row
+    seam_values: dict      # seam name -> (depths, thicknesses) per row
+    cells: list            # requested raw cells per row
+
+def source_positions(headers, names):
+    """Return the index of each named column in headers (None if absent)"""
+    return [headers.index(name) if name in headers else None for name in names]
+
+def scan_coal_file(filepath, seam_columns, keep_columns=()):
+    """Read a coal CSV once, collecting depth/thickness values per seam
+
+    ``seam_columns`` maps each seam name to its (top, thick) header
+    patterns. The raw cells of ``keep_columns`` are collected in the same
+    pass, blank where the file lacks a column.
+    """
+    with open(filepath, 'r', newline='', buffering=CSV_BUFFER_SIZE) as f:
+        reader = csv.reader(f)
+        headers = next(reader)
+
+        patterns = ['county']
+        for top, thick in seam_columns.values():
+            patterns += [top, thick]
+        cols = resolve_columns(headers, patterns)
+        county_idx = cols['county']
+        seams = {seam_name: {'top': cols[top], 'thick': cols[thick]}
+                 for seam_name, (top, thick) in seam_columns.items()}
+
+        counties, seam_values, cells = collect_seam_values(
+            reader, county_idx, seams, source_positions(headers, keep_columns))
+
+    return CoalScan(headers, seams, counties, seam_values, cells)
 
-def summarize_major_coals(filepath):
+def summarize_major_coals(scan):
     """Summarize major coals data (Danville, Herrin, Springfield)"""
     print("\n" + "=" * 60)
     print("MAJOR COALS SUMMARY (Danville, Herrin, Springfield)")
     print("=" * 60)
 
-    with open(filepath, 'r', newline='') as f:
-        reader = csv.reader(f)
-        headers = next(reader)
-        rows = list(reader)
-
-    print(f"\nTotal records: {len(rows)}")
-    print(f"Columns: {headers}")
+    print(f"\nTotal records: {len(scan.counties)}")
+    print(f"Columns: {scan.headers}")
 
-    # Find column indices
-    county_idx = find_column(headers, ['county'])
-
-    # Seam-specific columns
-    seams = {
-        'Danville': {'top': find_column(headers, ['top_danville']),
-                     'thick': find_column(headers, ['thick_danville'])},
-        'Herrin': {'top': find_column(headers, ['top_herrin']),
-                   'thick': find_column(headers, ['thick_herrin'])},
-        'Springfield': {'top': find_column(headers, ['top_spring']),
-                       'thick': find_column(headers, ['thick_spring'])}
-    }
+    is_crawford = scan.counties == 'CRAWFORD'
 
     # Calculate stats per seam
-    for seam_name, indices in seams.items():
+    for seam_name in scan.seams:
         print(f"\n--- {seam_name} Coal ---")
 
-        depths = []
-        thicknesses = []
-        by_county = defaultdict(lambda: {'depths': [], 'thicks': []})
-
-        for row in rows:
-            county = row[county_idx] if county_idx is not None else 'Unknown'
-            top = parse_float(row[indices['top']]) if indices['top'] is not None else None
-            thick = parse_float(row[indices['thick']]) if indices['thick'] is not None else None
+        depths, thicknesses = scan.seam_values[seam_name]
 
-            if top is not None:
-                depths.append(top)
-                by_county[county]['depths'].append(top)
-            if thick is not None:
-                thicknesses.append(thick)
-                by_county[county]['thicks'].append(thick)
+        d_count, d_min, d_max, d_mean = column_stats(depths)
+        if d_count:
+            print(f"  Records with depth data: {d_count}")
+            print(f"  Depth range: {d_min:.1f} - {d_max:.1f} ft")
+            print(f"  Depth mean: {d_mean:.1f} ft")
 
-        if depths:
-            print(f"  Records with depth data: {len(depths)}")
-            print(f"  Depth range: {min(depths):.1f} - {max(depths):.1f} ft")
-            print(f"  Depth mean: {sum(depths)/len(depths):.1f} ft")
-
-        if thicknesses:
-            print(f"  Records with thickness data: {len(thicknesses)}")
-            print(f"  Thickness range: {min(thicknesses):.2f} - {max(thicknesses):.2f} ft")
-            print(f"  Thickness mean: {sum(thicknesses)/len(thicknesses):.2f} ft")
+        t_count, t_min, t_max, t_mean = column_stats(thicknesses)
+        if t_count:
+            print(f"  Records with thickness data: {t_count}")
+            print(f"  Thickness range: {t_min:.2f} - {t_max:.2f} ft")
+            print(f"  Thickness mean: {t_mean:.2f} ft")
 
         # Crawford County specifics
-        if 'CRAWFORD' in by_county:
-            craw = by_county['CRAWFORD']
+        d_count, d_min, d_max, d_mean = column_stats(depths[is_crawford])
+        t_count, t_min, t_max, t_mean = column_stats(thicknesses[is_crawford])
+        if d_count or t_count:
             print(f"  Crawford County:")
-            if craw['depths']:
-                print(f"    Depth: {min(craw['depths']):.1f} - {max(craw['depths']):.1f} ft (mean: {sum(craw['depths'])/len(craw['depths']):.1f})")
-            if craw['thicks']:
-                print(f"    Thickness: {min(craw['thicks']):.2f} - {max(craw['thicks']):.2f} ft (mean: {sum(craw['thicks'])/len(craw['thicks']):.2f})")
+            if d_count:
+                print(f"    Depth: {d_min:.1f} - {d_max:.1f} ft (mean: {d_mean:.1f})")
+            if t_count:
+                print(f"    Thickness: {t_min:.2f} - {t_max:.2f} ft (mean: {t_mean:.2f})")
 
-def summarize_minor_coals(filepath):
+def summarize_minor_coals(scan):
     """Summarize minor coals data (Colchester, Seelyville, etc.)"""
     print("\n" + "=" * 60)
     print("MINOR COALS SUMMARY (Jamestown, Colchester, Seelyville, etc.)")
     print("=" * 60)
 
-    with open(filepath, 'r', newline='') as f:
-        reader = csv.reader(f)
-        headers = next(reader)
-        rows = list(reader)
-
-    print(f"\nTotal records: {len(rows)}")
-
-    county_idx = find_column(headers, ['county'])
-
-    seams = {
-        'Jamestown': {'top': find_column(headers, ['top_jtown']),
-                      'thick': find_column(headers, ['thick_jtown'])},
-        'Colchester': {'top': find_column(headers, ['top_colch']),
-                       'thick': find_column(headers, ['thick_colch'])},
-        'Seelyville': {'top': find_column(headers, ['top_seely']),
-                       'thick': find_column(headers, ['thick_seely'])},
-        'Dekoven': {'top': find_column(headers, ['top_dekoven']),
-                    'thick': find_column(headers, ['thick_dekoven'])},
-        'Davis': {'top': find_column(headers, ['top_davis']),
-                  'thick': find_column(headers, ['thick_davis'])}
-    }
-
-    for seam_name, indices in seams.items():
-        depths = []
-        thicknesses = []
-        by_county = defaultdict(lambda: {'depths': [], 'thicks': []})
-
-        for row in rows:
-            county = row[county_idx] if county_idx is not None else 'Unknown'
-            top = parse_float(row[indices['top']]) if indices['top'] is not None else None
-            thick = parse_float(row[indices['thick']]) if indices['thick'] is not None else None
-
-            if top is not None:
-                depths.append(top)
-                by_county[county]['depths'].append(top)
-            if thick is not None:
-                thicknesses.append(thick)
-                by_county[county]['thicks'].append(thick)
-
-        if depths or thicknesses:
+    print(f"\nTotal records: {len(scan.counties)}")
+
+    is_crawford = scan.counties == 'CRAWFORD'
+
+    for seam_name in scan.seams:
+        depths, thicknesses = scan.seam_values[seam_name]
+        d_count, d_min, d_max, d_mean = column_stats(depths)
+        t_count, t_min, t_max, t_mean = column_stats(thicknesses)
+
+        if d_count or t_count:
             print(f"\n--- {seam_name} Coal ---")
-            if depths:
-                print(f"  Records with depth data: {len(depths)}")
-                print(f"  Depth range: {min(depths):.1f} - {max(depths):.1f} ft")
-                print(f"  Depth mean: {sum(depths)/len(depths):.1f} ft")
-            if thicknesses:
-                print(f"  Records with thickness data: {len(thicknesses)}")
-                print(f"  Thickness range: {min(thicknesses):.2f} - {max(thicknesses):.2f} ft")
-                print(f"  Thickness mean: {sum(thicknesses)/len(thicknesses):.2f} ft")
-
-            if 'CRAWFORD' in by_county:
-                craw = by_county['CRAWFORD']
+            if d_count:
+                print(f"  Records with depth data: {d_count}")
+                print(f"  Depth range: {d_min:.1f} - {d_max:.1f} ft")
+                print(f"  Depth mean: {d_mean:.1f} ft")
+            if t_count:
+                print(f"  Records with thickness data: {t_count}")
+                print(f"  Thickness range: {t_min:.2f} - {t_max:.2f} ft")
+                print(f"  Thickness mean: {t_mean:.2f} ft")
+
+            d_count, d_min, d_max, _ = column_stats(depths[is_crawford])
+            t_count, t_min, t_max, _ = column_stats(thicknesses[is_crawford])
+            if d_count or t_count:
                 print(f"  Crawford County:")
-                if craw['depths']:
-                    print(f"    Depth: {min(craw['depths']):.1f} - {max(craw['depths']):.1f} ft")
-                if craw['thicks']:
-                    print(f"    Thickness: {min(craw['thicks']):.2f} - {max(craw['thicks']):.2f} ft")
+                if d_count:
+                    print(f"    Depth: {d_min:.1f} - {d_max:.1f} ft")
+                if t_count:
+                    print(f"    Thickness: {t_min:.2f} - {t_max:.2f} ft")
+
+def create_combined_csv(major, minor, output_path=COMBINED_CSV):
+    """Create a combined CSV with all seam data in a single row per location
 
-def create_combined_csv():
-    """Create a combined CSV with all seam data in a single row per location"""
+    Uses the cells kept by the major- and minor-coals scans, so neither
+    source file is read again.
+    """
     print("\n" + "=" * 60)
     print("CREATING COMBINED CSV")
     print("=" * 60)
 
-    # Read major coals
-    with open('data/csv/major-coals-all-study-area.csv', 'r') as f:
-        reader = csv.DictReader(f)
-        major_rows = list(reader)
-
-    # Read minor coals
-    with open('data/csv/minor-coals-all-study-area.csv', 'r') as f:
-        reader = csv.DictReader(f)
-        minor_rows = list(reader)
-
-    # Create lookup by IDS for minor coals
-    minor_by_ids = {row['IDS']: row for row in minor_rows}
-
-    # Combined headers
-    combined_headers = [
-        'IDS', 'COUNTY_NAME', 'LONGITUDE', 'LATITUDE', 'SURFELV', 'WELL_TYPE', 'LOG_TYPE',
-        'TOP_DANVILLE', 'THICK_DANVILLE',
-        'TOP_HERRIN', 'THICK_HERRIN',
-        'TOP_SPRING', 'THICK_SPRING',
-        'TOP_COLCH', 'THICK_COLCH',
-        'TOP_SEELY', 'THICK_SEELY'
-    ]
-
-    combined_rows = []
-    for row in major_rows:
-        ids = row['IDS']
-        minor_data = minor_by_ids.get(ids, {})
-
-        combined = {
-            'IDS': ids,
-            'COUNTY_NAME': row['COUNTY_NAME'],
-            'LONGITUDE': row['LONGITUDE'],
-            'LATITUDE': row['LATITUDE'],
-            'SURFELV': row['SURFELV'],
-            'WELL_TYPE': row['WELL_TYPE'],
-            'LOG_TYPE': row['LOG_TYPE'],
-            'TOP_DANVILLE': row.get('TOP_DANVILLE', ''),
-            'THICK_DANVILLE': row.get('THICK_DANVILLE', ''),
-            'TOP_HERRIN': row.get('TOP_HERRIN', ''),
-            'THICK_HERRIN': row.get('THICK_HERRIN', ''),
-            'TOP_SPRING': row.get('TOP_SPRING', ''),
-            'THICK_SPRING': row.get('THICK_SPRING', ''),
-            'TOP_COLCH': minor_data.get('TOP_COLCH', ''),
-            'THICK_COLCH': minor_data.get('THICK_COLCH', ''),
-            'TOP_SEELY': minor_data.get('TOP_SEELY', ''),
-            'THICK_SEELY': minor_data.get('THICK_SEELY', '')
-        }
-        combined_rows.append(combined)
-
-    output_path = 'data/csv/all-coals-study-area-combined.csv'
-    with open(output_path, 'w', newline='') as f:
-        writer = csv.DictWriter(f, fieldnames=combined_headers)
-        writer.writeheader()
-        writer.writerows(combined_rows)
-
-    print(f"Combined {len(combined_rows)} records")
+    # Create lookup by IDS for minor coals; minor cells are IDS first,
+    # then the minor combined columns
+    minor_by_ids = {cells[0]: cells[1:] for cells in minor.cells}
+    no_minor = [''] * len(MINOR_COMBINED_COLS)
+
+    # Major cells start with IDS, matching MAJOR_COMBINED_COLS
+    with open(output_path, 'w', newline='', buffering=CSV_BUFFER_SIZE) as out:
+        writerow = make_row_writer(out)
+        writerow(COMBINED_HEADERS)
+        for cells in major.cells:
+            writerow(cells + minor_by_ids.get(cells[0], no_minor))
+
+    print(f"Combined {len(major.cells)} records")
     print(f"Saved to: {output_path}")
 
 def print_cbm_assessment():
@@ -254,9 +304,15 @@ if __name__ == '__main__':
     print("CRAWFORD COUNTY + SURROUNDING AREA COAL DATA SUMMARY")
     print("=" * 60)
 
-    summarize_major_coals('data/csv/major-coals-all-study-area.csv')
-    summarize_minor_coals('data/csv/minor-coals-all-study-area.csv')
-    create_combined_csv()
+    # Each study-area file is read exactly once; the scans also keep the
+    # cells needed for the combined CSV
+    major = scan_coal_file(MAJOR_CSV, MAJOR_SEAMS, keep_columns=MAJOR_COMBINED_COLS)
+    minor = scan_coal_file(MINOR_CSV, MINOR_SEAMS,
+                           keep_columns=['IDS'] + MINOR_COMBINED_COLS)
+
+    summarize_major_coals(major)
+    summarize_minor_coals(minor)
+    create_combined_csv(major, minor)
     print_cbm_assessment()
 
     print("\n" + "=" * 60)
@@ -8,17 +8,22 @@ Creates:
 
 import argparse
 import os
-from math import sqrt
-from typing import Optional
+from functools import partial
+from math import cos, radians, sqrt
+from typing import TYPE_CHECKING, NamedTuple, Optional
 
 import numpy as np
-import pydeck as pdk
-import plotly.graph_objects as go
 
-# Import shared utilities from existing module
+# pydeck and plotly are imported where they are used, so --skip-3d and
+# --skip-section runs don't pay for loading the one they skip
+if TYPE_CHECKING:
+    import pydeck as pdk
+
+# Import shared utilities from existing modules
+from filter_study_area import map_with_logs
 from visualize_coal_data import (
-    DrillHole, SEAMS, STUDY_COUNTIES,
-    load_drill_holes, filter_valid, load_county_boundaries
+    DrillHoleArray, SEAMS, STUDY_COUNTIES,
+    load_drill_holes, filter_valid, load_county_boundaries, read_drill_hole_table
 )
 
 # 3D Configuration
@@ -44,53 +49,93 @@ SEAM_COLORS_PLOTLY = {
     'seelyville': 'orange',
 }
 
+# Cross-section layout shared by every transect; the title and axis ranges
+# are added per transect
+CROSS_SECTION_LAYOUT = dict(
+    hovermode='closest',
+    legend=dict(
+        x=1.02,
+        y=1,
+        bgcolor='rgba(255, 255, 255, 0.8)',
+    ),
+    height=600,
+    margin=dict(r=150),
+)
+
+
+class HoleArrays(NamedTuple):
+    """Numeric columns of a seam's drill holes for vectorized math (NaN = missing)"""
+    lon: np.ndarray
+    lat: np.ndarray
+    surfelv: np.ndarray
+    depth: np.ndarray
+    thickness: np.ndarray
+    valid: np.ndarray  # Has a surface elevation and is not an outlier
+
+
+def holes_to_arrays(holes: DrillHoleArray) -> HoleArrays:
+    """Take the numeric drill hole columns and the validity mask"""
+    return HoleArrays(
+        lon=holes.lon,
+        lat=holes.lat,
+        surfelv=holes.surfelv,
+        depth=holes.depth,
+        thickness=holes.thickness,
+        valid=~holes.is_outlier & ~np.isnan(holes.surfelv),
+    )
+
 
-def create_seam_points(holes: list[DrillHole], seam_key: str,
+def create_seam_points(arrays: HoleArrays, seam_key: str,
                        vertical_exag: float = DEFAULT_VERTICAL_EXAGGERATION,
-                       base_elevation: float = 0) -> pdk.Layer:
+                       base_elevation: float = 0) -> 'pdk.Layer':
     """Create column layer showing where drill holes intersect a seam (as short columns at depth)"""
+    import pydeck as pdk
+
     seam = SEAMS[seam_key]
     color = SEAM_COLORS_3D[seam_key]
     seam_name = seam['name']
 
-    data = []
-    for h in holes:
-        if h.depth is None or h.surfelv is None:
-            continue
-        if h.is_outlier:
-            continue
-
-        # Calculate elevation relative to base, then apply vertical exaggeration
-        # Depth is positive (feet below surface), so seam is at (surfelv - depth)
-        seam_abs_elev = h.surfelv - h.depth  # Absolute elevation in feet
-        # Convert to relative elevation from base, in meters, with exaggeration
-        seam_rel_elev = (seam_abs_elev - base_elevation) * 0.3048 * vertical_exag
-
-        # Column height represents seam thickness
-        # Scale: 1 ft thickness = 200 meters visual height (exaggerated for visibility)
-        # This makes a 4 ft seam = 800m tall, 1 ft seam = 200m tall
-        thickness_ft = h.thickness if h.thickness and h.thickness > 0 else 0.5
-        column_height = thickness_ft * 200  # 200 meters per foot of thickness
-
-        data.append({
-            'position': [h.lon, h.lat],
-            'elevation': seam_rel_elev,
-            'height': column_height,
-            'thickness': round(h.thickness, 1) if h.thickness else 0,
-            'depth': round(h.depth),
+    keep = arrays.valid & ~np.isnan(arrays.depth)
+    depth = arrays.depth[keep]
+    thickness = np.nan_to_num(arrays.thickness[keep])
+
+    # Calculate elevation relative to base in feet; the layer's
+    # elevation_scale converts to meters and applies vertical exaggeration
+    # Depth is positive (feet below surface), so seam is at (surfelv - depth)
+    seam_abs_elev = arrays.surfelv[keep] - depth  # Absolute elevation in feet
+    seam_rel_elev = seam_abs_elev - base_elevation
+
+    # Tooltip depth in whole feet
+    depth_label = np.rint(depth).astype(np.int64)
+
+    # pydeck serializes layer data to JSON for the standalone HTML (binary
+    # attributes only reach the browser through the Jupyter widget), and the
+    # tooltip reads per-row fields, so rows are built once from the columns.
+    # Coordinates are rounded to 6 decimals (~0.1 m) and elevations to 0.01 ft
+    # to keep the embedded JSON short.
+    data = [
+        {
+            'position': [lon, lat],
+            'elevation': elev,
+            # Missing and zero thickness stay int 0 in the JSON, not 0.0
+            'thickness': round(thick, 1) if thick else 0,
+            'depth': d,
             'seam': seam_name,
-            'color': color,
-        })
+        }
+        for lon, lat, elev, thick, d in zip(
+            np.round(arrays.lon[keep], 6).tolist(), np.round(arrays.lat[keep], 6).tolist(),
+            np.round(seam_rel_elev, 2).tolist(), thickness.tolist(), depth_label.tolist())
+    ]
 
     return pdk.Layer(
         'ColumnLayer',
         data=data,
         get_position='position',
         get_elevation='elevation',
-        get_fill_color='color',
+        get_fill_color=color,
         get_line_color=[0, 0, 0, 80],
         radius=80,  # Smaller radius so columns don't overlap
-        elevation_scale=1,
+        elevation_scale=0.3048 * vertical_exag,  # Feet to meters, with exaggeration
         extruded=True,
         pickable=True,
         auto_highlight=True,
@@ -99,68 +144,61 @@ def create_seam_points(holes: list[DrillHole], seam_key: str,
     )
 
 
-def create_drillhole_columns(all_holes: dict[str, list[DrillHole]],
+def create_drillhole_columns(hole_arrays: dict[str, HoleArrays],
                              vertical_exag: float = DEFAULT_VERTICAL_EXAGGERATION,
-                             base_elevation: float = 0) -> pdk.Layer:
+                             base_elevation: float = 0) -> 'pdk.Layer':
     """Create ColumnLayer showing drill holes as vertical lines from surface to deepest seam"""
+    import pydeck as pdk
 
-    # Collect all unique drill hole locations with their data
-    hole_data = {}  # keyed by (lon, lat) tuple
-
-    for seam_key, holes in all_holes.items():
-        for h in holes:
-            if h.surfelv is None or h.is_outlier:
-                continue
-
-            key = (round(h.lon, 6), round(h.lat, 6))
-
-            if key not in hole_data:
-                hole_data[key] = {
-                    'lon': h.lon,
-                    'lat': h.lat,
-                    'surfelv': h.surfelv,
-                    'min_elev': h.surfelv,
-                    'seams': [],
-                }
-
-            # Track deepest point for this hole
-            if h.depth is not None:
-                seam_bottom = h.surfelv - h.depth - (h.thickness or 0)
-                if seam_bottom < hole_data[key]['min_elev']:
-                    hole_data[key]['min_elev'] = seam_bottom
-
-                hole_data[key]['seams'].append({
-                    'name': SEAMS[seam_key]['name'],
-                    'depth': h.depth,
-                    'thickness': h.thickness,
-                })
-
-    # Build layer data
-    data = []
-    for info in hole_data.values():
-        # Column goes from min_elev to surface (height in feet)
-        column_height_ft = info['surfelv'] - info['min_elev']
-        if column_height_ft < 10:  # Skip if no meaningful depth data
-            continue
-
-        # Convert to meters with exaggeration
-        column_height_m = column_height_ft * 0.3048 * vertical_exag
-        min_elev_m = (info['min_elev'] - base_elevation) * 0.3048 * vertical_exag
-
-        seam_list = ', '.join(s['name'] for s in info['seams'])
-
-        # Get max depth for tooltip
-        max_depth = max((s['depth'] for s in info['seams']), default=0)
+    # Stack the valid holes of every seam
+    columns = list(hole_arrays.values())
+    lon, lat, surfelv, depth, thickness = (
+        np.concatenate([getattr(a, field)[a.valid] for a in columns])
+        for field in ('lon', 'lat', 'surfelv', 'depth', 'thickness')
+    )
 
-        data.append({
-            'position': [info['lon'], info['lat']],
-            'elevation': min_elev_m,
-            'height': column_height_m,
-            'seam': f"Drill Hole ({len(info['seams'])} seams)",
+    # Group by location rounded to 6 decimals; the first hole seen at a
+    # location supplies its coordinates and surface elevation
+    keys = (np.rint(lon * 1e6).astype(np.int64) << 32) | (np.rint(lat * 1e6).astype(np.int64) & 0xffffffff)
+    _, first, group = np.unique(keys, return_index=True, return_inverse=True)
+    n_groups = first.size
+
+    # Track deepest point and seam count for each hole
+    has_depth = ~np.isnan(depth)
+    seam_bottom = surfelv - depth - np.nan_to_num(thickness)
+    min_elev = surfelv[first]
+    np.minimum.at(min_elev, group[has_depth], seam_bottom[has_depth])
+    max_depth = np.full(n_groups, -np.inf)
+    np.maximum.at(max_depth, group[has_depth], depth[has_depth])
+    n_seams = np.bincount(group[has_depth], minlength=n_groups)
+    max_depth[n_seams == 0] = 0
+
+    # Column goes from min_elev to surface (height in feet); skip holes
+    # without meaningful depth data and keep first-seen order
+    column_height_ft = surfelv[first] - min_elev
+    rows = np.argsort(first)
+    rows = rows[column_height_ft[rows] >= 10]
+
+    # Elevation above base in feet; elevation_scale converts to meters and
+    # applies vertical exaggeration on the GPU
+    min_elev_ft = min_elev[rows] - base_elevation
+
+    # Build layer data, rounded like the seam layers
+    data = [
+        {
+            'position': [x, y],
+            'elevation': elev,
+            'seam': f"Drill Hole ({count} seams)",
             'thickness': 0,  # N/A for drill holes
-            'depth': round(max_depth) if max_depth else 0,
-            'surfelv': info['surfelv'],
-        })
+            'depth': deepest,
+            'surfelv': surface,
+        }
+        for x, y, elev, count, deepest, surface in zip(
+            np.round(lon[first[rows]], 6).tolist(), np.round(lat[first[rows]], 6).tolist(),
+            np.round(min_elev_ft, 2).tolist(),
+            n_seams[rows].tolist(), np.rint(max_depth[rows]).astype(np.int64).tolist(),
+            surfelv[first[rows]].tolist())
+    ]
 
     return pdk.Layer(
         'ColumnLayer',
@@ -170,7 +208,7 @@ def create_drillhole_columns(all_holes: dict[str, list[DrillHole]],
         get_fill_color=[150, 150, 150, 80],  # Semi-transparent gray
         get_line_color=[100, 100, 100, 150],
         radius=100,  # Radius in meters
-        elevation_scale=1,
+        elevation_scale=0.3048 * vertical_exag,  # Feet to meters, with exaggeration
         extruded=True,
         pickable=True,
         auto_highlight=True,
@@ -202,46 +240,54 @@ def get_legend_html() -> str:
     '''
 
 
-def create_3d_terrain_view(all_holes: dict[str, list[DrillHole]],
+def create_3d_terrain_view(hole_arrays: dict[str, HoleArrays],
                            vertical_exag: float = DEFAULT_VERTICAL_EXAGGERATION,
                            output_path: str = 'visualizations/interactive/3d-terrain.html'):
     """Create full 3D terrain view with all seams"""
-
-    # Calculate map center and base elevation from all data
-    all_valid = []
-    all_elevations = []
-    for holes in all_holes.values():
-        for h in holes:
-            if h.depth is not None and not h.is_outlier and h.surfelv is not None:
-                all_valid.append(h)
-                all_elevations.append(h.surfelv - h.depth)  # Seam elevation
-                all_elevations.append(h.surfelv)  # Surface elevation
-
-    if not all_valid:
+    import pydeck as pdk
+
+    # Calculate map center and base elevation from all data, accumulating
+    # per seam over holes with depth data
+    n_valid = 0
+    sum_lat = sum_lon = 0.0
+    min_elevation, max_elevation = np.inf, -np.inf
+    for arrays in hole_arrays.values():
+        keep = arrays.valid & ~np.isnan(arrays.depth)
+        if not keep.any():
+            continue
+        surfelv = arrays.surfelv[keep]
+        seam_elev = surfelv - arrays.depth[keep]
+        n_valid += int(np.count_nonzero(keep))
+        sum_lat += arrays.lat[keep].sum()
+        sum_lon += arrays.lon[keep].sum()
+        # Seam and surface elevations both bound the view
+        min_elevation = min(min_elevation, seam_elev.min(), surfelv.min())
+        max_elevation = max(max_elevation, seam_elev.max(), surfelv.max())
+
+    if not n_valid:
         print("  No valid data for 3D view")
         return
 
-    center_lat = sum(h.lat for h in all_valid) / len(all_valid)
-    center_lon = sum(h.lon for h in all_valid) / len(all_valid)
+    center_lat = sum_lat / n_valid
+    center_lon = sum_lon / n_valid
 
     # Use minimum elevation as base (so everything renders above 0)
-    base_elevation = min(all_elevations) - 100  # 100 ft buffer below lowest point
-    max_elevation = max(all_elevations)
+    base_elevation = min_elevation - 100  # 100 ft buffer below lowest point
 
-    print(f"  Center: ({center_lat:.4f}, {center_lon:.4f}), {len(all_valid)} points")
+    print(f"  Center: ({center_lat:.4f}, {center_lon:.4f}), {n_valid} points")
     print(f"  Elevation range: {base_elevation:.0f} to {max_elevation:.0f} ft")
 
     # Create layers
     layers = []
 
     # Add drill hole columns first (rendered at bottom)
-    columns_layer = create_drillhole_columns(all_holes, vertical_exag, base_elevation)
+    columns_layer = create_drillhole_columns(hole_arrays, vertical_exag, base_elevation)
     layers.append(columns_layer)
 
     # Add seam layers (rendered on top of columns)
     for seam_key in SEAMS:
-        if seam_key in all_holes:
-            layer = create_seam_points(all_holes[seam_key], seam_key, vertical_exag, base_elevation)
+        if seam_key in hole_arrays:
+            layer = create_seam_points(hole_arrays[seam_key], seam_key, vertical_exag, base_elevation)
             layers.append(layer)
 
     # Set up view state
@@ -271,83 +317,82 @@ def create_3d_terrain_view(all_holes: dict[str, list[DrillHole]],
         }
     )
 
-    # Save to HTML
-    deck.to_html(output_path)
-
-    # Add legend to the HTML
-    with open(output_path, 'r') as f:
-        html = f.read()
+    # Render to a string so the legend is added before the single write
+    html = deck.to_html(as_string=True)
 
     # Insert legend before closing body tag
-    legend = get_legend_html()
-    html = html.replace('</body>', legend + '</body>')
+    body_end = html.rfind('</body>')
+    html = html[:body_end] + get_legend_html() + html[body_end:]
 
-    with open(output_path, 'w') as f:
+    with open(output_path, 'w', encoding='utf-8') as f:
         f.write(html)
 
     print(f"  Saved: {output_path}")
 
 
-def project_to_transect(holes: list[DrillHole],
+def miles_per_degree(start: tuple[float, float],
+                     end: tuple[float, float]) -> tuple[float, float]:
+    """Return (longitude, latitude) miles per degree at a transect's mid-latitude"""
+    mid_lat = (start[1] + end[1]) / 2
+    return 69.172 * cos(radians(mid_lat)), 69.0
+
+
+def project_to_transect(arrays: HoleArrays,
                         start: tuple[float, float],
                         end: tuple[float, float],
-                        buffer_miles: float = 2.0) -> list[dict]:
+                        buffer_miles: float = 2.0) -> dict[str, np.ndarray]:
     """
     Project drill holes onto a transect line.
 
     Args:
-        holes: List of drill holes
+        arrays: Drill hole columns from holes_to_arrays()
         start: (lon, lat) of transect start
         end: (lon, lat) of transect end
         buffer_miles: Include holes within this distance of transect
 
     Returns:
-        List of dicts with 'distance' (miles along transect) and hole data
+        Dict of arrays ('distance' in miles along transect, 'perp_distance',
+        'surfelv', 'depth', 'thickness'), sorted by distance
     """
-    # Convert buffer to approximate degrees (1 degree ~ 69 miles at this latitude)
-    buffer_deg = buffer_miles / 69.0
+    # Work in miles so distances need no conversion afterwards
+    mi_per_lon, mi_per_lat = miles_per_degree(start, end)
 
     # Transect vector
-    dx = end[0] - start[0]
-    dy = end[1] - start[1]
+    dx = (end[0] - start[0]) * mi_per_lon
+    dy = (end[1] - start[1]) * mi_per_lat
     length = sqrt(dx**2 + dy**2)
 
     if length == 0:
-        return []
-
-    # Unit vector along transect
-    ux, uy = dx / length, dy / length
-
-    projected = []
-    for h in holes:
-        if h.surfelv is None or h.is_outlier:
-            continue
-
-        # Vector from start to hole
-        hx = h.lon - start[0]
-        hy = h.lat - start[1]
-
-        # Distance along transect (dot product)
+        keep = np.empty(0, dtype=np.intp)
+        along = perp = np.empty(0)
+    else:
+        # Unit vector along transect
+        ux, uy = dx / length, dy / length
+
+        # Vectors from start to each hole
+        hx = (arrays.lon - start[0]) * mi_per_lon
+        hy = (arrays.lat - start[1]) * mi_per_lat
+
+        # Distance along transect (dot product) and perpendicular to it
+        # (cross product magnitude)
         along = hx * ux + hy * uy
+        perp = np.abs(hx * uy - hy * ux)
 
-        # Distance perpendicular to transect (cross product magnitude)
-        perp = abs(hx * uy - hy * ux)
-
-        # Check if within buffer and along transect
-        if perp <= buffer_deg and 0 <= along <= length:
-            # Convert to miles
-            distance_miles = along * 69.0
-
-            projected.append({
-                'distance': distance_miles,
-                'hole': h,
-                'perp_distance': perp * 69.0,
-            })
+        # Keep holes within buffer and along transect, ordered by distance
+        mask = arrays.valid & (perp <= buffer_miles) & (along >= 0) & (along <= length)
+        keep = np.where(mask)[0]
+        keep = keep[np.argsort(along[keep], kind='stable')]
 
-    return sorted(projected, key=lambda x: x['distance'])
+    return {
+        'distance': along[keep],
+        'perp_distance': perp[keep],
+        'surfelv': arrays.surfelv[keep],
+        'depth': arrays.depth[keep],
+        'thickness': arrays.thickness[keep],
+    }
 
 
-def create_cross_section(all_holes: dict[str, list[DrillHole]],
+def create_cross_section(hole_arrays: dict[str, HoleArrays],
                          start: tuple[float, float],
                          end: tuple[float, float],
                          vertical_exag: float = DEFAULT_VERTICAL_EXAGGERATION,
@@ -355,33 +400,31 @@ def create_cross_section(all_holes: dict[str, list[DrillHole]],
                          output_path: str = 'visualizations/interactive/cross-section.html',
                          title_suffix: str = ''):
     """Create cross-section view along a transect"""
-
-    fig = go.Figure()
+    import plotly.graph_objects as go
 
     # Collect all projected points
     all_projected = {}
-    for seam_key, holes in all_holes.items():
-        projected = project_to_transect(holes, start, end, buffer_miles)
+    for seam_key, arrays in hole_arrays.items():
+        projected = project_to_transect(arrays, start, end, buffer_miles)
         all_projected[seam_key] = projected
 
-    # Find all unique distances for surface profile
-    surface_points = []
-    for seam_key, projected in all_projected.items():
-        for p in projected:
-            surface_points.append((p['distance'], p['hole'].surfelv, p['hole']))
+    # Surface profile samples from every seam's projected holes
+    surface_distances = np.concatenate([p['distance'] for p in all_projected.values()])
+    surface_elevations = np.concatenate([p['surfelv'] for p in all_projected.values()])
+    n_points = surface_distances.size
 
-    if not surface_points:
+    if not n_points:
         print(f"  No drill holes found along transect")
         return
 
-    # Sort and deduplicate surface points by distance
-    surface_points.sort(key=lambda x: x[0])
-
-    # Plot surface profile
-    distances = [p[0] for p in surface_points]
-    elevations = [p[1] for p in surface_points]
+    # Sort by distance, keeping the first sample at each coincident distance
+    order = np.argsort(surface_distances, kind='stable')
+    distances, first = np.unique(surface_distances[order], return_index=True)
+    elevations = surface_elevations[order][first]
 
-    fig.add_trace(go.Scatter(
+    # Plot surface profile. Traces are collected and the figure is built
+    # once at the end instead of growing it trace by trace.
+    traces = [go.Scattergl(
         x=distances,
         y=elevations,
         mode='lines',
@@ -390,11 +433,11 @@ def create_cross_section(all_holes: dict[str, list[DrillHole]],
         fill='tozeroy',
         fillcolor='rgba(139, 69, 19, 0.2)',
         hovertemplate='Distance: %{x:.1f} mi<br>Surface Elev: %{y:.0f} ft<extra>Surface</extra>',
-    ))
+    )]
 
     # Track min/max for axis range
-    min_elev = min(elevations)
-    max_elev = max(elevations)
+    min_elev = surface_elevations.min()
+    max_elev = surface_elevations.max()
 
     # Plot each seam
     for seam_key in ['danville', 'herrin', 'springfield', 'colchester', 'seelyville']:
@@ -402,52 +445,35 @@ def create_cross_section(all_holes: dict[str, list[DrillHole]],
             continue
 
         projected = all_projected[seam_key]
-        if not projected:
-            continue
-
         seam_name = SEAMS[seam_key]['name']
         color = SEAM_COLORS_PLOTLY[seam_key]
         rgba = SEAM_COLORS_3D[seam_key]
 
-        seam_distances = []
-        seam_tops = []
-        seam_bottoms = []
-        thicknesses = []
-
-        for p in projected:
-            h = p['hole']
-            if h.depth is None:
-                continue
-
-            seam_top = h.surfelv - h.depth
-            thick = h.thickness or 0
-            seam_bottom = seam_top - thick
-
-            seam_distances.append(p['distance'])
-            seam_tops.append(seam_top)
-            seam_bottoms.append(seam_bottom)
-            thicknesses.append(thick)
+        has_depth = ~np.isnan(projected['depth'])
+        if not has_depth.any():
+            continue
 
-            # Track min for axis
-            if seam_bottom < min_elev:
-                min_elev = seam_bottom
+        seam_distances = projected['distance'][has_depth]
+        seam_tops = projected['surfelv'][has_depth] - projected['depth'][has_depth]
+        thicknesses = np.nan_to_num(projected['thickness'][has_depth])
+        seam_bottoms = seam_tops - thicknesses
 
-        if not seam_distances:
-            continue
+        # Sort by distance (ties by top, bottom, thickness)
+        order = np.lexsort((thicknesses, seam_bottoms, seam_tops, seam_distances))
+        seam_distances = seam_distances[order]
+        seam_tops = seam_tops[order]
+        seam_bottoms = seam_bottoms[order]
+        thicknesses = thicknesses[order]
 
-        # Sort by distance
-        sorted_data = sorted(zip(seam_distances, seam_tops, seam_bottoms, thicknesses))
-        seam_distances = [d[0] for d in sorted_data]
-        seam_tops = [d[1] for d in sorted_data]
-        seam_bottoms = [d[2] for d in sorted_data]
-        thicknesses = [d[3] for d in sorted_data]
+        # Track min for axis
+        min_elev = np.min(seam_bottoms, initial=min_elev)
 
         # Plot seam as filled area between top and bottom
         # Create polygon by going forward on top, backward on bottom
-        x_polygon = seam_distances + seam_distances[::-1]
-        y_polygon = seam_tops + seam_bottoms[::-1]
+        x_polygon = np.concatenate([seam_distances, seam_distances[::-1]])
+        y_polygon = np.concatenate([seam_tops, seam_bottoms[::-1]])
 
-        fig.add_trace(go.Scatter(
+        traces.append(go.Scattergl(
             x=x_polygon,
             y=y_polygon,
             fill='toself',
@@ -463,7 +489,7 @@ def create_cross_section(all_holes: dict[str, list[DrillHole]],
         ))
 
         # Also plot individual drill hole points as markers
-        fig.add_trace(go.Scatter(
+        traces.append(go.Scattergl(
             x=seam_distances,
             y=seam_tops,
             mode='markers',
@@ -480,35 +506,29 @@ def create_cross_section(all_holes: dict[str, list[DrillHole]],
         ))
 
     # Compute transect length in miles
-    transect_length = sqrt((end[0] - start[0])**2 + (end[1] - start[1])**2) * 69
+    mi_per_lon, mi_per_lat = miles_per_degree(start, end)
+    transect_length = sqrt(((end[0] - start[0]) * mi_per_lon)**2 + ((end[1] - start[1]) * mi_per_lat)**2)
 
     # Configure layout
     elev_range = max_elev - min_elev
 
-    fig.update_layout(
+    fig = go.Figure(data=traces, layout=dict(
+        CROSS_SECTION_LAYOUT,
         title=dict(
             text=f'Cross-Section View{title_suffix}<br>'
                  f'<sup>Transect: ({start[0]:.2f}, {start[1]:.2f}) to ({end[0]:.2f}, {end[1]:.2f}) | '
-                 f'Buffer: {buffer_miles} mi | Points: {len(surface_points)}</sup>',
+                 f'Buffer: {buffer_miles} mi | Points: {n_points}</sup>',
             font=dict(size=16),
         ),
-        xaxis_title='Distance Along Transect (miles)',
-        yaxis_title='Elevation (ft above sea level)',
-        hovermode='closest',
-        legend=dict(
-            x=1.02,
-            y=1,
-            bgcolor='rgba(255, 255, 255, 0.8)',
-        ),
         yaxis=dict(
+            title=dict(text='Elevation (ft above sea level)'),
             range=[min_elev - elev_range * 0.1, max_elev + elev_range * 0.1],
         ),
         xaxis=dict(
+            title=dict(text='Distance Along Transect (miles)'),
             range=[0, transect_length],
         ),
-        height=600,
-        margin=dict(r=150),
-    )
+    ))
 
     # Add optimal depth annotation
     fig.add_hline(y=max_elev - 500, line_dash="dash", line_color="green",
@@ -516,11 +536,25 @@ def create_cross_section(all_holes: dict[str, list[DrillHole]],
     fig.add_hline(y=max_elev - 1000, line_dash="dash", line_color="green",
                   annotation_text="1000 ft depth", annotation_position="right")
 
-    # Save to HTML
-    fig.write_html(output_path, include_plotlyjs=True, full_html=True)
+    # Save to HTML. The cross-sections share one plotly.min.js written next
+    # to them instead of each embedding its own copy.
+    fig.write_html(output_path, include_plotlyjs='directory', full_html=True)
     print(f"  Saved: {output_path}")
 
 
+def render_cross_section(hole_arrays: dict[str, HoleArrays],
+                         transect: tuple[str, tuple[float, float], tuple[float, float], str],
+                         vertical_exag: float = DEFAULT_VERTICAL_EXAGGERATION,
+                         buffer_miles: float = 2.0):
+    """Create one named cross-section"""
+    label, start, end, filename = transect
+
+    print(f"  {label} transect: {start} to {end}")
+    create_cross_section(hole_arrays, start, end, vertical_exag, buffer_miles,
+                         output_path=f'visualizations/interactive/{filename}',
+                         title_suffix=f' ({label})')
+
+
 def get_default_transect() -> tuple[tuple[float, float], tuple[float, float]]:
     """Return default transect line through Crawford County (E-W)"""
     # Crawford County approximate center: 39.0, -87.75
@@ -582,17 +616,19 @@ Examples:
     # Load data
     print("\nLoading drill hole data...")
     csv_path = 'data/csv/all-coals-study-area-combined.csv'
-    all_holes = {}
+    table = read_drill_hole_table(csv_path)
+    hole_arrays = {}
 
+    # Column arrays are shared by the 3D view and every transect, so build them once
     for seam_key in SEAMS:
-        holes, stats = load_drill_holes(csv_path, seam_key)
-        all_holes[seam_key] = holes
+        holes, stats = load_drill_holes(table, seam_key)
+        hole_arrays[seam_key] = holes_to_arrays(holes)
         print(f"  {SEAMS[seam_key]['name']}: {stats['has_depth']} with depth data")
 
     # Generate 3D terrain view
     if not args.skip_3d:
         print("\nGenerating 3D terrain view...")
-        create_3d_terrain_view(all_holes, args.exag)
+        create_3d_terrain_view(hole_arrays, args.exag)
 
     # Generate cross-sections
     if not args.skip_section:
@@ -603,29 +639,18 @@ Examples:
             start = tuple(map(float, args.transect_start.split(',')))
             end = tuple(map(float, args.transect_end.split(',')))
             print(f"  Using custom transect: {start} to {end}")
-            create_cross_section(all_holes, start, end, args.exag, args.buffer,
+            create_cross_section(hole_arrays, start, end, args.exag, args.buffer,
                                title_suffix=' (Custom)')
         else:
-            # Generate default E-W transect
-            start, end = get_default_transect()
-            print(f"  E-W transect: {start} to {end}")
-            create_cross_section(all_holes, start, end, args.exag, args.buffer,
-                               output_path='visualizations/interactive/cross-section.html',
-                               title_suffix=' (E-W)')
-
-            # Generate N-S transect
-            ns_start, ns_end = get_ns_transect()
-            print(f"  N-S transect: {ns_start} to {ns_end}")
-            create_cross_section(all_holes, ns_start, ns_end, args.exag, args.buffer,
-                               output_path='visualizations/interactive/cross-section-ns.html',
-                               title_suffix=' (N-S)')
-
-            # Generate diagonal transect
-            diag_start, diag_end = get_diagonal_transect()
-            print(f"  NW-SE transect: {diag_start} to {diag_end}")
-            create_cross_section(all_holes, diag_start, diag_end, args.exag, args.buffer,
-                               output_path='visualizations/interactive/cross-section-nwse.html',
-                               title_suffix=' (NW-SE)')
+            # The default transects are independent, so render them in parallel
+            transects = [
+                ('E-W', *get_default_transect(), 'cross-section.html'),
+                ('N-S', *get_ns_transect(), 'cross-section-ns.html'),
+                ('NW-SE', *get_diagonal_transect(), 'cross-section-nwse.html'),
+            ]
+            render = partial(render_cross_section, hole_arrays,
+                             vertical_exag=args.exag, buffer_miles=args.buffer)
+            map_with_logs(render, transects)
 
     print("\n" + "=" * 60)
     print("3D VISUALIZATION COMPLETE")
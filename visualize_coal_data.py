@@ -4,8 +4,14 @@
 import csv
 import os
 from dataclasses import dataclass
+from functools import partial
+from math import isnan
 from typing import Optional
 
+import numpy as np
+
+from filter_study_area import map_with_logs
+
 # Domain-based bounds for data validation (conservative - flagging, not removing)
 THICKNESS_MIN = 0.0      # ft - can't be negative
 THICKNESS_MAX = 50.0     # ft - catches obvious data entry errors (typical seams 0.5-8 ft)
@@ -26,17 +32,28 @@ SEAMS = {
 }
 
 @dataclass
-class DrillHole:
-    """Single drill hole record with coal seam data"""
-    ids: str
-    county: str
-    lon: float
-    lat: float
-    surfelv: float
-    thickness: Optional[float]  # For current seam
-    depth: Optional[float]      # Calculated: surfelv - top elevation
-    is_outlier: bool = False
-    outlier_reason: str = ''
+class DrillHoleArray:
+    """Drill hole records for one coal seam, stored column-wise
+
+    Each field holds one entry per drill hole; missing thickness and depth
+    values are NaN.
+    """
+    ids: np.ndarray             # str
+    county: np.ndarray          # str
+    lon: np.ndarray
+    lat: np.ndarray
+    surfelv: np.ndarray         # 0 where missing
+    thickness: np.ndarray       # For current seam
+    depth: np.ndarray           # Calculated: surfelv - top elevation
+    is_outlier: np.ndarray      # bool
+    outlier_reason: np.ndarray  # str, '' unless flagged
+
+    def __len__(self) -> int:
+        return len(self.lon)
+
+    def select(self, mask: np.ndarray) -> 'DrillHoleArray':
+        """Return the drill holes where mask is True"""
+        return DrillHoleArray(**{name: values[mask] for name, values in vars(self).items()})
 
 
 def parse_float(val: str) -> Optional[float]:
@@ -49,95 +66,133 @@ def parse_float(val: str) -> Optional[float]:
         return None
 
 
-def load_drill_holes(csv_path: str, seam_key: str) -> tuple[list[DrillHole], dict]:
-    """Load drill hole data for a specific seam with validation"""
+def parse_float_column(values: list[str]) -> np.ndarray:
+    """Parse a column of strings to float64, NaN where empty/invalid"""
+    column = np.char.strip(np.asarray(values, dtype=str))
+    column[column == ''] = 'nan'
+    try:
+        return column.astype(np.float64)
+    except ValueError:
+        # Some cell is not a number; fall back to parsing cell by cell
+        parsed = (parse_float(val) for val in values)
+        return np.fromiter((np.nan if val is None else val for val in parsed),
+                           dtype=np.float64, count=len(values))
+
+
+def read_csv_columns(csv_path: str, names: list[str]) -> dict[str, list[str]]:
+    """Read the named columns of a CSV as lists of strings ('' where absent)"""
+    with open(csv_path, 'r', newline='') as f:
+        reader = csv.reader(f)
+        headers = next(reader, [])
+        rows = [row for row in reader if row]  # DictReader skips blank lines too
+
+    columns = {}
+    for name in names:
+        if name in headers:
+            i = headers.index(name)
+            columns[name] = [row[i] if i < len(row) else '' for row in rows]
+        else:
+            columns[name] = [''] * len(rows)
+    return columns
+
+
+def read_drill_hole_table(csv_path: str) -> dict:
+    """Read the drill hole CSV once for all seams
+
+    IDS and COUNTY_NAME stay lists of strings; coordinate, elevation and
+    every seam's top/thickness column are parsed to float64 arrays (NaN
+    marks missing values).
+    """
+    text_cols = ['IDS', 'COUNTY_NAME']
+    float_cols = ['LONGITUDE', 'LATITUDE', 'SURFELV']
+    for seam in SEAMS.values():
+        float_cols += [seam['top_col'], seam['thick_col']]
+
+    columns = read_csv_columns(csv_path, text_cols + float_cols)
+    for name in float_cols:
+        columns[name] = parse_float_column(columns[name])
+    return columns
+
+
+def load_drill_holes(table: dict, seam_key: str) -> tuple[DrillHoleArray, dict]:
+    """Load drill hole data for a specific seam with validation
+
+    Args:
+        table: Columns from read_drill_hole_table()
+        seam_key: Key into SEAMS
+    """
     seam = SEAMS[seam_key]
-    holes = []
+    lon = table['LONGITUDE']
+    lat = table['LATITUDE']
+    surfelv = table['SURFELV']
+    top_elev = table[seam['top_col']]
+    thickness = table[seam['thick_col']]
+
+    # Calculate depth from surface (NaN unless both elevations are present)
+    depth = surfelv - top_elev
+
+    # Rows without coordinates are skipped
+    has_coords = ~np.isnan(lon) & ~np.isnan(lat)
+    has_thickness = has_coords & ~np.isnan(thickness)
+    has_depth = has_coords & ~np.isnan(depth)
+
+    # Check for outliers: coordinates first, then thickness if present,
+    # otherwise depth
+    outside = has_coords & ~((STUDY_LON_MIN <= lon) & (lon <= STUDY_LON_MAX) &
+                             (STUDY_LAT_MIN <= lat) & (lat <= STUDY_LAT_MAX))
+    bad_thickness = (has_thickness & ~outside &
+                     ((thickness < THICKNESS_MIN) | (thickness > THICKNESS_MAX)))
+    bad_depth = (has_depth & ~has_thickness & ~outside &
+                 ((depth < DEPTH_MIN) | (depth > DEPTH_MAX)))
+
+    is_outlier = outside | bad_thickness | bad_depth
+    valid_thickness = thickness[has_thickness & ~is_outlier]
+
     stats = {
-        'total_rows': 0,
-        'valid_coords': 0,
-        'has_thickness': 0,
-        'has_depth': 0,
-        'outliers_thickness': 0,
-        'outliers_depth': 0,
-        'outliers_coords': 0,
+        'total_rows': len(lon),
+        'valid_coords': int(has_coords.sum()),
+        'has_thickness': int(has_thickness.sum()),
+        'has_depth': int(has_depth.sum()),
+        'outliers_thickness': int(bad_thickness.sum()),
+        'outliers_depth': int(bad_depth.sum()),
+        'outliers_coords': int(outside.sum()),
+        # Shared color scale limit for the thickness maps (0 when no data)
+        'thick_max': float(valid_thickness.max()) if valid_thickness.size else 0.0,
     }
 
-    with open(csv_path, 'r', newline='') as f:
-        reader = csv.DictReader(f)
-        for row in reader:
-            stats['total_rows'] += 1
-
-            # Parse coordinates
-            lon = parse_float(row.get('LONGITUDE', ''))
-            lat = parse_float(row.get('LATITUDE', ''))
-            surfelv = parse_float(row.get('SURFELV', ''))
-
-            if lon is None or lat is None:
-                continue
-            stats['valid_coords'] += 1
-
-            # Parse seam-specific data
-            top_elev = parse_float(row.get(seam['top_col'], ''))
-            thickness = parse_float(row.get(seam['thick_col'], ''))
-
-            # Calculate depth from surface
-            depth = None
-            if surfelv is not None and top_elev is not None:
-                depth = surfelv - top_elev
-
-            # Create drill hole record
-            hole = DrillHole(
-                ids=row.get('IDS', ''),
-                county=row.get('COUNTY_NAME', ''),
-                lon=lon,
-                lat=lat,
-                surfelv=surfelv or 0,
-                thickness=thickness,
-                depth=depth,
-            )
-
-            # Check for outliers
-            if not (STUDY_LON_MIN <= lon <= STUDY_LON_MAX and
-                    STUDY_LAT_MIN <= lat <= STUDY_LAT_MAX):
-                hole.is_outlier = True
-                hole.outlier_reason = 'coords_outside_study_area'
-                stats['outliers_coords'] += 1
-            elif thickness is not None:
-                if thickness < THICKNESS_MIN or thickness > THICKNESS_MAX:
-                    hole.is_outlier = True
-                    hole.outlier_reason = f'thickness={thickness:.1f}'
-                    stats['outliers_thickness'] += 1
-            elif depth is not None:
-                if depth < DEPTH_MIN or depth > DEPTH_MAX:
-                    hole.is_outlier = True
-                    hole.outlier_reason = f'depth={depth:.0f}'
-                    stats['outliers_depth'] += 1
-
-            # Track stats
-            if thickness is not None:
-                stats['has_thickness'] += 1
-            if depth is not None:
-                stats['has_depth'] += 1
-
-            holes.append(hole)
+    # Reasons are only formatted for the flagged rows
+    reason = np.full(len(lon), '', dtype=object)
+    reason[outside] = 'coords_outside_study_area'
+    reason[bad_thickness] = [f'thickness={t:.1f}' for t in thickness[bad_thickness].tolist()]
+    reason[bad_depth] = [f'depth={d:.0f}' for d in depth[bad_depth].tolist()]
+
+    # Create drill hole records for rows with coordinates
+    holes = DrillHoleArray(
+        ids=np.array(table['IDS'], dtype=object)[has_coords],
+        county=np.array(table['COUNTY_NAME'], dtype=object)[has_coords],
+        lon=lon[has_coords],
+        lat=lat[has_coords],
+        surfelv=np.where(np.isnan(surfelv), 0.0, surfelv)[has_coords],
+        thickness=thickness[has_coords],
+        depth=depth[has_coords],
+        is_outlier=is_outlier[has_coords],
+        outlier_reason=reason[has_coords],
+    )
 
     return holes, stats
 
 
-def filter_valid(holes: list[DrillHole], require_thickness: bool = False,
-                 require_depth: bool = False, exclude_outliers: bool = True) -> list[DrillHole]:
+def filter_valid(holes: DrillHoleArray, require_thickness: bool = False,
+                 require_depth: bool = False, exclude_outliers: bool = True) -> DrillHoleArray:
     """Filter drill holes based on criteria"""
-    result = []
-    for h in holes:
-        if exclude_outliers and h.is_outlier:
-            continue
-        if require_thickness and h.thickness is None:
-            continue
-        if require_depth and h.depth is None:
-            continue
-        result.append(h)
-    return result
+    keep = np.ones(len(holes), dtype=bool)
+    if exclude_outliers:
+        keep &= ~holes.is_outlier
+    if require_thickness:
+        keep &= ~np.isnan(holes.thickness)
+    if require_depth:
+        keep &= ~np.isnan(holes.depth)
+    return holes.select(keep)
 
 
 # Study counties for highlighting
@@ -148,13 +203,20 @@ import shapefile  # pyshp
 
 
 def load_county_boundaries(shp_path: str, study_counties: set[str] = None) -> list[dict]:
-    """Load county boundary polygons from shapefile"""
+    """Load county boundary polygons from shapefile
+
+    study_counties optionally limits the result to those county names
+    (case-insensitive).
+    """
     sf = shapefile.Reader(shp_path)
     counties = []
 
-    for shape_rec in sf.shapeRecords():
+    wanted = {c.upper() for c in study_counties} if study_counties else None
+
+    for shape_rec in sf.iterShapeRecords():
         name = shape_rec.record['COUNTY_NAM']  # Field name from the shapefile
-        if study_counties and name.upper() not in study_counties:
+        name_upper = name.upper()
+        if wanted and name_upper not in wanted:
             continue
 
         # Get polygon points
@@ -162,133 +224,146 @@ def load_county_boundaries(shp_path: str, study_counties: set[str] = None) -> li
         # Handle multi-part polygons
         parts = list(shape_rec.shape.parts) + [len(points)]
 
-        polygons = []
-        for i in range(len(parts) - 1):
-            poly_points = points[parts[i]:parts[i+1]]
-            polygons.append(poly_points)
+        # Each part becomes an Nx2 (lon, lat) array; the [lat, lon] lists
+        # folium wants are built here once instead of in every map
+        polygons = [np.asarray(points[parts[i]:parts[i+1]], dtype=np.float64)
+                    for i in range(len(parts) - 1)]
 
         counties.append({
             'name': name,
+            'name_upper': name_upper,
             'polygons': polygons,
+            'latlon_polygons': [poly[:, ::-1].tolist() for poly in polygons],
         })
 
     return counties
 
 
-import matplotlib.pyplot as plt
 import matplotlib.colors as mcolors
+from matplotlib.backends.backend_agg import FigureCanvasAgg
+from matplotlib.figure import Figure
 from matplotlib.patches import Polygon
-from matplotlib.collections import PatchCollection
-import numpy as np
+from matplotlib.collections import LineCollection, PolyCollection
 
 
 def plot_county_boundaries(ax, counties: list[dict], study_counties: set[str] = None):
     """Draw county boundaries on matplotlib axis"""
-    for county in counties:
-        for poly_points in county['polygons']:
-            xs = [p[0] for p in poly_points]
-            ys = [p[1] for p in poly_points]
-            ax.plot(xs, ys, 'k-', linewidth=0.5, alpha=0.7)
-
-            # Highlight study counties
-            if study_counties and county['name'].upper() in study_counties:
-                ax.fill(xs, ys, alpha=0.05, color='blue')
-
-
-def create_thickness_map(holes: list[DrillHole], seam_name: str,
-                         counties: list[dict], output_path: str):
-    """Create static thickness map with county boundaries"""
+    # One collection for all borders and one for the study-county fill,
+    # rather than a Line2D and a Polygon artist per polygon part
+    borders = [poly for county in counties for poly in county['polygons']]
+    ax.add_collection(LineCollection(borders, colors='k', linewidths=0.5, alpha=0.7))
+
+    # Highlight study counties
+    if study_counties:
+        study_polys = [poly for county in counties
+                       if county['name_upper'] in study_counties
+                       for poly in county['polygons']]
+        if study_polys:
+            ax.add_collection(PolyCollection(study_polys, facecolors='blue',
+                                             edgecolors='blue', alpha=0.05))
+
+
+def create_thickness_map(holes: DrillHoleArray, seam_name: str,
+                         counties: list[dict], output_path: str, thick_max: float):
+    """Create static thickness map with county boundaries
+
+    thick_max is the seam's largest valid thickness, from the
+    load_drill_holes stats.
+    """
     # Filter to holes with thickness data
-    valid = [h for h in holes if h.thickness is not None and not h.is_outlier]
-    outliers = [h for h in holes if h.thickness is not None and h.is_outlier]
+    has_thickness = ~np.isnan(holes.thickness)
+    valid = has_thickness & ~holes.is_outlier
+    outliers = has_thickness & holes.is_outlier
+    n_valid = int(valid.sum())
+    n_outliers = int(outliers.sum())
 
-    if not valid:
+    if not n_valid:
         print(f"  No valid thickness data for {seam_name}")
         return
 
-    fig, ax = plt.subplots(figsize=(12, 10))
+    fig = Figure(figsize=(12, 10))
+    FigureCanvasAgg(fig)
+    ax = fig.add_subplot()
 
     # Plot county boundaries first
     plot_county_boundaries(ax, counties, STUDY_COUNTIES)
 
     # Extract data for plotting
-    lons = [h.lon for h in valid]
-    lats = [h.lat for h in valid]
-    thicks = [h.thickness for h in valid]
+    thicks = holes.thickness[valid]
 
     # Create scatter plot with sequential colormap
-    scatter = ax.scatter(lons, lats, c=thicks, cmap='YlOrRd',
+    scatter = ax.scatter(holes.lon[valid], holes.lat[valid], c=thicks, cmap='YlOrRd',
                          s=20, alpha=0.7, edgecolors='none',
-                         vmin=0, vmax=max(8, max(thicks)))
+                         vmin=0, vmax=max(8, thick_max))
 
     # Plot outliers in gray
-    if outliers:
-        out_lons = [h.lon for h in outliers]
-        out_lats = [h.lat for h in outliers]
-        ax.scatter(out_lons, out_lats, c='gray', s=10, alpha=0.3,
-                   marker='x', label=f'Outliers ({len(outliers)})')
+    if n_outliers:
+        ax.scatter(holes.lon[outliers], holes.lat[outliers], c='gray', s=10, alpha=0.3,
+                   marker='x', label=f'Outliers ({n_outliers})')
 
     # Colorbar
-    cbar = plt.colorbar(scatter, ax=ax, shrink=0.8)
+    cbar = fig.colorbar(scatter, ax=ax, shrink=0.8)
     cbar.set_label('Thickness (ft)', fontsize=12)
 
     # Labels and title
     ax.set_xlabel('Longitude', fontsize=12)
     ax.set_ylabel('Latitude', fontsize=12)
     ax.set_title(f'{seam_name} Coal - Thickness Map\n'
-                 f'({len(valid)} points, {len(outliers)} outliers excluded)',
+                 f'({n_valid} points, {n_outliers} outliers excluded)',
                  fontsize=14)
 
     # Set aspect ratio for geographic data
     ax.set_aspect('equal')
 
-    if outliers:
+    if n_outliers:
         ax.legend(loc='lower right')
 
-    plt.tight_layout()
-    plt.savefig(output_path, dpi=150, bbox_inches='tight')
-    plt.close()
+    fig.tight_layout()
+    fig.savefig(output_path, dpi=150, bbox_inches='tight')
     print(f"  Saved: {output_path}")
 
 
-def create_depth_map(holes: list[DrillHole], seam_name: str,
+def create_depth_map(holes: DrillHoleArray, seam_name: str,
                      counties: list[dict], output_path: str):
     """Create static depth map highlighting optimal CBM range (500-1000 ft)"""
     # Filter to holes with depth data
-    valid = [h for h in holes if h.depth is not None and not h.is_outlier]
-    outliers = [h for h in holes if h.depth is not None and h.is_outlier]
+    depth = holes.depth
+    valid = ~np.isnan(depth) & ~holes.is_outlier
 
-    if not valid:
+    if not valid.any():
         print(f"  No valid depth data for {seam_name}")
         return
 
-    fig, ax = plt.subplots(figsize=(12, 10))
+    fig = Figure(figsize=(12, 10))
+    FigureCanvasAgg(fig)
+    ax = fig.add_subplot()
 
     # Plot county boundaries
     plot_county_boundaries(ax, counties, STUDY_COUNTIES)
 
     # Separate into optimal range and outside
-    optimal = [h for h in valid if 500 <= h.depth <= 1000]
-    shallow = [h for h in valid if h.depth < 500]
-    deep = [h for h in valid if h.depth > 1000]
+    optimal = valid & (depth >= 500) & (depth <= 1000)
+    shallow = valid & (depth < 500)
+    deep = valid & (depth > 1000)
+    n_optimal, n_shallow, n_deep = int(optimal.sum()), int(shallow.sum()), int(deep.sum())
 
     # Plot with different colors for depth ranges
-    if shallow:
-        ax.scatter([h.lon for h in shallow], [h.lat for h in shallow],
-                   c=[h.depth for h in shallow], cmap='Blues',
-                   s=15, alpha=0.5, vmin=0, vmax=500, label=f'Shallow <500ft ({len(shallow)})')
-
-    if optimal:
-        ax.scatter([h.lon for h in optimal], [h.lat for h in optimal],
-                   c=[h.depth for h in optimal], cmap='Greens',
+    if n_shallow:
+        ax.scatter(holes.lon[shallow], holes.lat[shallow],
+                   c=depth[shallow], cmap='Blues',
+                   s=15, alpha=0.5, vmin=0, vmax=500, label=f'Shallow <500ft ({n_shallow})')
+
+    if n_optimal:
+        ax.scatter(holes.lon[optimal], holes.lat[optimal],
+                   c=depth[optimal], cmap='Greens',
                    s=25, alpha=0.8, vmin=500, vmax=1000,
                    edgecolors='darkgreen', linewidths=0.5,
-                   label=f'Optimal 500-1000ft ({len(optimal)})')
+                   label=f'Optimal 500-1000ft ({n_optimal})')
 
-    if deep:
-        ax.scatter([h.lon for h in deep], [h.lat for h in deep],
-                   c=[h.depth for h in deep], cmap='Oranges',
-                   s=15, alpha=0.5, vmin=1000, vmax=2000, label=f'Deep >1000ft ({len(deep)})')
+    if n_deep:
+        ax.scatter(holes.lon[deep], holes.lat[deep],
+                   c=depth[deep], cmap='Oranges',
+                   s=15, alpha=0.5, vmin=1000, vmax=2000, label=f'Deep >1000ft ({n_deep})')
 
     # Labels and title
     ax.set_xlabel('Longitude', fontsize=12)
@@ -300,24 +375,26 @@ def create_depth_map(holes: list[DrillHole], seam_name: str,
     ax.set_aspect('equal')
     ax.legend(loc='lower right', fontsize=10)
 
-    plt.tight_layout()
-    plt.savefig(output_path, dpi=150, bbox_inches='tight')
-    plt.close()
+    fig.tight_layout()
+    fig.savefig(output_path, dpi=150, bbox_inches='tight')
     print(f"  Saved: {output_path}")
 
 
-def create_histogram(holes: list[DrillHole], seam_name: str, output_path: str):
+def create_histogram(holes: DrillHoleArray, seam_name: str, output_path: str):
     """Create histogram of thickness and depth distribution"""
-    valid_thick = [h.thickness for h in holes if h.thickness is not None and not h.is_outlier]
-    valid_depth = [h.depth for h in holes if h.depth is not None and not h.is_outlier]
+    valid_thick = holes.thickness[~np.isnan(holes.thickness) & ~holes.is_outlier]
+    valid_depth = holes.depth[~np.isnan(holes.depth) & ~holes.is_outlier]
 
-    fig, axes = plt.subplots(1, 2, figsize=(14, 5))
+    fig = Figure(figsize=(14, 5))
+    FigureCanvasAgg(fig)
+    axes = fig.subplots(1, 2)
 
     # Thickness histogram
-    if valid_thick:
+    if valid_thick.size:
+        thick_median = np.median(valid_thick)
         axes[0].hist(valid_thick, bins=30, color='coral', edgecolor='black', alpha=0.7)
-        axes[0].axvline(np.median(valid_thick), color='red', linestyle='--',
-                        label=f'Median: {np.median(valid_thick):.2f} ft')
+        axes[0].axvline(thick_median, color='red', linestyle='--',
+                        label=f'Median: {thick_median:.2f} ft')
         axes[0].set_xlabel('Thickness (ft)', fontsize=12)
         axes[0].set_ylabel('Count', fontsize=12)
         axes[0].set_title(f'{seam_name} - Thickness Distribution (n={len(valid_thick)})')
@@ -327,19 +404,23 @@ def create_histogram(holes: list[DrillHole], seam_name: str, output_path: str):
         axes[0].set_title(f'{seam_name} - Thickness Distribution')
 
     # Depth histogram with optimal range highlighted
-    if valid_depth:
-        n, bins, patches = axes[1].hist(valid_depth, bins=30, color='steelblue',
-                                         edgecolor='black', alpha=0.7)
-        # Highlight optimal range
-        for i, (b, patch) in enumerate(zip(bins[:-1], patches)):
-            if 500 <= b <= 1000:
-                patch.set_facecolor('green')
-                patch.set_alpha(0.8)
-
+    if valid_depth.size:
+        # Bin once and color the bars by their left edge, highlighting
+        # the optimal range
+        counts, edges = np.histogram(valid_depth, bins=30)
+        optimal = ((edges[:-1] >= 500) & (edges[:-1] <= 1000))[:, np.newaxis]
+        facecolors = np.where(optimal, mcolors.to_rgba('green', 0.8),
+                              mcolors.to_rgba('steelblue', 0.7))
+        edgecolors = np.where(optimal, mcolors.to_rgba('black', 0.8),
+                              mcolors.to_rgba('black', 0.7))
+        axes[1].bar(edges[:-1], counts, width=np.diff(edges), align='edge',
+                    color=facecolors, edgecolor=edgecolors)
+
+        depth_median = np.median(valid_depth)
         axes[1].axvline(500, color='green', linestyle='--', alpha=0.7)
         axes[1].axvline(1000, color='green', linestyle='--', alpha=0.7)
-        axes[1].axvline(np.median(valid_depth), color='red', linestyle='-',
-                        label=f'Median: {np.median(valid_depth):.0f} ft')
+        axes[1].axvline(depth_median, color='red', linestyle='-',
+                        label=f'Median: {depth_median:.0f} ft')
         axes[1].set_xlabel('Depth from Surface (ft)', fontsize=12)
         axes[1].set_ylabel('Count', fontsize=12)
         axes[1].set_title(f'{seam_name} - Depth Distribution (n={len(valid_depth)})\n'
@@ -349,55 +430,52 @@ def create_histogram(holes: list[DrillHole], seam_name: str, output_path: str):
         axes[1].text(0.5, 0.5, 'No depth data', ha='center', va='center')
         axes[1].set_title(f'{seam_name} - Depth Distribution')
 
-    plt.tight_layout()
-    plt.savefig(output_path, dpi=150, bbox_inches='tight')
-    plt.close()
+    fig.tight_layout()
+    fig.savefig(output_path, dpi=150, bbox_inches='tight')
     print(f"  Saved: {output_path}")
 
 
 import folium
-from folium.plugins import MarkerCluster
+from folium.features import GeoJsonPopup
+from folium.plugins import FastMarkerCluster
+
+
+# Hex colors from yellow (255,255,0) to red (255,0,0), indexed by green level
+THICKNESS_HEX = np.array([f'#ff{g:02x}00' for g in range(256)], dtype=object)
 
 
-def get_thickness_color(thickness: float, max_thick: float = 8.0) -> str:
-    """Return color for thickness value (yellow to red sequential)"""
-    if thickness is None:
-        return 'gray'
+def get_thickness_colors(thickness: np.ndarray, max_thick: float = 8.0) -> np.ndarray:
+    """Return colors for thickness values (yellow to red sequential)"""
     # Normalize to 0-1
-    norm = min(thickness / max_thick, 1.0)
-    # Yellow (255,255,0) to Red (255,0,0)
-    r = 255
-    g = int(255 * (1 - norm))
-    b = 0
-    return f'#{r:02x}{g:02x}{b:02x}'
-
-
-def get_depth_color(depth: float) -> str:
-    """Return color based on depth range"""
-    if depth is None:
-        return 'gray'
-    if depth < 500:
-        return 'blue'       # Too shallow
-    elif depth <= 1000:
-        return 'green'      # Optimal
-    else:
-        return 'orange'     # Deep
+    norm = np.minimum(thickness / max_thick, 1.0)
+    green = np.clip((255 * (1 - norm)).astype(np.int64), 0, 255)
+    return THICKNESS_HEX[green]
+
+
+def get_depth_colors(depth: np.ndarray) -> np.ndarray:
+    """Return colors based on depth range"""
+    return np.where(depth < 500, 'blue',              # Too shallow
+                    np.where(depth <= 1000, 'green',  # Optimal
+                             'orange')).astype(object)  # Deep
 
 
-def create_interactive_map(holes: list[DrillHole], seam_name: str, seam_key: str,
-                           counties: list[dict], output_path: str):
+def create_interactive_map(holes: DrillHoleArray, seam_name: str, seam_key: str,
+                           counties: list[dict], output_path: str, thick_max: float):
     """Create interactive folium map with drill hole data"""
     # Filter valid data
-    valid = [h for h in holes if (h.thickness is not None or h.depth is not None)
-             and not h.is_outlier]
+    has_thickness = ~np.isnan(holes.thickness)
+    valid = (has_thickness | ~np.isnan(holes.depth)) & ~holes.is_outlier
 
-    if not valid:
+    if not valid.any():
         print(f"  No valid data for interactive map: {seam_name}")
         return
 
+    lats = holes.lat[valid].tolist()
+    lons = holes.lon[valid].tolist()
+
     # Center map on data
-    center_lat = sum(h.lat for h in valid) / len(valid)
-    center_lon = sum(h.lon for h in valid) / len(valid)
+    center_lat = float(holes.lat[valid].mean())
+    center_lon = float(holes.lon[valid].mean())
 
     # Create map
     m = folium.Map(location=[center_lat, center_lon], zoom_start=9,
@@ -405,9 +483,8 @@ def create_interactive_map(holes: list[DrillHole], seam_name: str, seam_key: str
 
     # Add county boundaries
     for county in counties:
-        if county['name'].upper() in STUDY_COUNTIES:
-            for poly_points in county['polygons']:
-                coords = [[p[1], p[0]] for p in poly_points]  # folium uses [lat, lon]
+        if county['name_upper'] in STUDY_COUNTIES:
+            for coords in county['latlon_polygons']:  # folium uses [lat, lon]
                 folium.Polygon(
                     locations=coords,
                     color='black',
@@ -418,41 +495,45 @@ def create_interactive_map(holes: list[DrillHole], seam_name: str, seam_key: str
                     popup=county['name']
                 ).add_to(m)
 
-    # Create marker cluster for performance
-    marker_cluster = MarkerCluster(name=f'{seam_name} Drill Holes').add_to(m)
-
     # Add drill hole markers
-    max_thick = max((h.thickness for h in valid if h.thickness), default=8)
-
-    for h in valid:
+    max_thick = thick_max or 8
+
+    # Color by thickness if available, else by depth
+    thicks = holes.thickness[valid]
+    has_thick = ~np.isnan(thicks)
+    colors = get_depth_colors(holes.depth[valid])
+    colors[has_thick] = get_thickness_colors(thicks[has_thick], max_thick)
+
+    # Each marker is one [lat, lon, color, popup] row; the whole list is
+    # embedded as a single JSON array and turned into markers in the browser
+    rows = []
+    for lat, lon, color, ids, county, surfelv, thickness, depth in zip(
+            lats, lons, colors.tolist(), holes.ids[valid], holes.county[valid],
+            holes.surfelv[valid].tolist(), thicks.tolist(), holes.depth[valid].tolist()):
         # Build popup content
         popup_html = f"""
-        <b>ID:</b> {h.ids}<br>
-        <b>County:</b> {h.county}<br>
-        <b>Surface Elev:</b> {h.surfelv:.0f} ft<br>
+        <b>ID:</b> {ids}<br>
+        <b>County:</b> {county}<br>
+        <b>Surface Elev:</b> {surfelv:.0f} ft<br>
         """
-        if h.thickness is not None:
-            popup_html += f"<b>Thickness:</b> {h.thickness:.2f} ft<br>"
-        if h.depth is not None:
-            popup_html += f"<b>Depth:</b> {h.depth:.0f} ft<br>"
-            if 500 <= h.depth <= 1000:
+        if not isnan(thickness):
+            popup_html += f"<b>Thickness:</b> {thickness:.2f} ft<br>"
+        if not isnan(depth):
+            popup_html += f"<b>Depth:</b> {depth:.0f} ft<br>"
+            if 500 <= depth <= 1000:
                 popup_html += "<b style='color:green'>✓ Optimal CBM depth</b>"
 
-        # Color by thickness if available, else by depth
-        if h.thickness is not None:
-            color = get_thickness_color(h.thickness, max_thick)
-        else:
-            color = get_depth_color(h.depth)
-
-        folium.CircleMarker(
-            location=[h.lat, h.lon],
-            radius=5,
-            color=color,
-            fill=True,
-            fill_color=color,
-            fill_opacity=0.7,
-            popup=folium.Popup(popup_html, max_width=200)
-        ).add_to(marker_cluster)
+        rows.append([lat, lon, color, popup_html])
+
+    marker_callback = """function (row) {
+        var marker = L.circleMarker(new L.LatLng(row[0], row[1]), {
+            radius: 5, color: row[2], fill: true, fillColor: row[2], fillOpacity: 0.7
+        });
+        marker.bindPopup(row[3], {maxWidth: 200});
+        return marker;
+    }"""
+    FastMarkerCluster(rows, callback=marker_callback,
+                      name=f'{seam_name} Drill Holes').add_to(m)
 
     # Add legend
     legend_html = '''
@@ -480,20 +561,23 @@ def create_interactive_map(holes: list[DrillHole], seam_name: str, seam_key: str
     print(f"  Saved: {output_path}")
 
 
-def create_all_seams_map(all_holes: dict[str, list[DrillHole]],
+def create_all_seams_map(all_holes: dict[str, DrillHoleArray],
                          counties: list[dict], output_path: str):
     """Create interactive map with all seams as toggleable layers"""
     # Get center from any seam with data
-    all_valid = []
-    for holes in all_holes.values():
-        all_valid.extend([h for h in holes if h.thickness is not None and not h.is_outlier])
-
-    if not all_valid:
+    valid_by_seam = {seam_key: ~np.isnan(holes.thickness) & ~holes.is_outlier
+                     for seam_key, holes in all_holes.items()}
+    all_lats = np.concatenate([holes.lat[valid_by_seam[seam_key]]
+                               for seam_key, holes in all_holes.items()])
+    all_lons = np.concatenate([holes.lon[valid_by_seam[seam_key]]
+                               for seam_key, holes in all_holes.items()])
+
+    if not all_lats.size:
         print("  No valid data for all-seams map")
         return
 
-    center_lat = sum(h.lat for h in all_valid) / len(all_valid)
-    center_lon = sum(h.lon for h in all_valid) / len(all_valid)
+    center_lat = float(all_lats.mean())
+    center_lon = float(all_lons.mean())
 
     m = folium.Map(location=[center_lat, center_lon], zoom_start=9,
                    tiles='cartodbpositron')
@@ -501,9 +585,8 @@ def create_all_seams_map(all_holes: dict[str, list[DrillHole]],
     # Add county boundaries
     county_group = folium.FeatureGroup(name='County Boundaries')
     for county in counties:
-        if county['name'].upper() in STUDY_COUNTIES:
-            for poly_points in county['polygons']:
-                coords = [[p[1], p[0]] for p in poly_points]
+        if county['name_upper'] in STUDY_COUNTIES:
+            for coords in county['latlon_polygons']:
                 folium.Polygon(
                     locations=coords,
                     color='black',
@@ -525,29 +608,43 @@ def create_all_seams_map(all_holes: dict[str, list[DrillHole]],
 
     # Add each seam as a layer
     for seam_key, holes in all_holes.items():
-        valid = [h for h in holes if h.thickness is not None and not h.is_outlier]
-        if not valid:
+        valid = valid_by_seam[seam_key]
+        n_valid = int(valid.sum())
+        if not n_valid:
             continue
 
         seam_name = SEAMS[seam_key]['name']
         color = seam_colors.get(seam_key, 'gray')
 
-        fg = folium.FeatureGroup(name=f'{seam_name} ({len(valid)} pts)')
-
-        for h in valid:
-            popup = f"<b>{seam_name}</b><br>Thickness: {h.thickness:.2f} ft"
-            if h.depth:
-                popup += f"<br>Depth: {h.depth:.0f} ft"
-
-            folium.CircleMarker(
-                location=[h.lat, h.lon],
+        fg = folium.FeatureGroup(name=f'{seam_name} ({n_valid} pts)')
+
+        # One GeoJSON point per hole, carrying its popup text; the whole
+        # seam is rendered by a single layer with a shared marker style
+        features = []
+        for lat, lon, thickness, depth in zip(holes.lat[valid].tolist(), holes.lon[valid].tolist(),
+                                              holes.thickness[valid].tolist(),
+                                              holes.depth[valid].tolist()):
+            popup = f"<b>{seam_name}</b><br>Thickness: {thickness:.2f} ft"
+            if depth and not isnan(depth):
+                popup += f"<br>Depth: {depth:.0f} ft"
+
+            features.append({
+                'type': 'Feature',
+                'geometry': {'type': 'Point', 'coordinates': [lon, lat]},
+                'properties': {'popup': popup},
+            })
+
+        folium.GeoJson(
+            {'type': 'FeatureCollection', 'features': features},
+            marker=folium.CircleMarker(
                 radius=4,
                 color=color,
                 fill=True,
                 fill_color=color,
                 fill_opacity=0.6,
-                popup=popup
-            ).add_to(fg)
+            ),
+            popup=GeoJsonPopup(fields=['popup'], labels=False),
+        ).add_to(fg)
 
         fg.add_to(m)
 
@@ -558,32 +655,75 @@ def create_all_seams_map(all_holes: dict[str, list[DrillHole]],
 
 def generate_data_quality_report(all_stats: dict, output_path: str):
     """Generate text report of data quality issues"""
+    # Assemble the whole report first and write it in one call
+    lines = [
+        "COAL DATA QUALITY REPORT",
+        "=" * 60,
+        "",
+    ]
+
+    for seam_key, stats in all_stats.items():
+        seam_name = SEAMS[seam_key]['name']
+        lines += [
+            seam_name,
+            "-" * 40,
+            f"  Total rows:           {stats['total_rows']}",
+            f"  Valid coordinates:    {stats['valid_coords']}",
+            f"  Has thickness data:   {stats['has_thickness']}",
+            f"  Has depth data:       {stats['has_depth']}",
+            f"  Outliers (thickness): {stats['outliers_thickness']}",
+            f"  Outliers (depth):     {stats['outliers_depth']}",
+            f"  Outliers (coords):    {stats['outliers_coords']}",
+            "",
+        ]
+
+    lines += [
+        "=" * 60,
+        "Outlier criteria (conservative - flagged, not removed):",
+        f"  Thickness: < {THICKNESS_MIN} or > {THICKNESS_MAX} ft",
+        f"  Depth: < {DEPTH_MIN} or > {DEPTH_MAX} ft",
+        "  Coordinates: outside study area bounds",
+    ]
+
     with open(output_path, 'w') as f:
-        f.write("COAL DATA QUALITY REPORT\n")
-        f.write("=" * 60 + "\n\n")
-
-        for seam_key, stats in all_stats.items():
-            seam_name = SEAMS[seam_key]['name']
-            f.write(f"{seam_name}\n")
-            f.write("-" * 40 + "\n")
-            f.write(f"  Total rows:           {stats['total_rows']}\n")
-            f.write(f"  Valid coordinates:    {stats['valid_coords']}\n")
-            f.write(f"  Has thickness data:   {stats['has_thickness']}\n")
-            f.write(f"  Has depth data:       {stats['has_depth']}\n")
-            f.write(f"  Outliers (thickness): {stats['outliers_thickness']}\n")
-            f.write(f"  Outliers (depth):     {stats['outliers_depth']}\n")
-            f.write(f"  Outliers (coords):    {stats['outliers_coords']}\n")
-            f.write("\n")
-
-        f.write("=" * 60 + "\n")
-        f.write("Outlier criteria (conservative - flagged, not removed):\n")
-        f.write(f"  Thickness: < {THICKNESS_MIN} or > {THICKNESS_MAX} ft\n")
-        f.write(f"  Depth: < {DEPTH_MIN} or > {DEPTH_MAX} ft\n")
-        f.write(f"  Coordinates: outside study area bounds\n")
+        f.write("\n".join(lines) + "\n")
 
     print(f"Saved: {output_path}")
 
 
+def process_seam(table: dict, counties: list[dict],
+                 seam_key: str) -> tuple[DrillHoleArray, dict]:
+    """Load one seam and write its maps; return its holes and stats"""
+    seam_name = SEAMS[seam_key]['name']
+
+    print(f"\n{seam_name}:")
+    print("-" * 40)
+
+    # Load data
+    holes, stats = load_drill_holes(table, seam_key)
+
+    print(f"  Loaded {stats['valid_coords']} records")
+    print(f"  Thickness data: {stats['has_thickness']}")
+    print(f"  Depth data: {stats['has_depth']}")
+
+    # Generate static visualizations
+    print("  Generating static maps...")
+    create_thickness_map(holes, seam_name, counties,
+                        f'visualizations/static/{seam_key}-thickness-map.png',
+                        stats['thick_max'])
+    create_depth_map(holes, seam_name, counties,
+                    f'visualizations/static/{seam_key}-depth-map.png')
+    create_histogram(holes, seam_name,
+                    f'visualizations/static/{seam_key}-histogram.png')
+
+    # Generate interactive map
+    print("  Generating interactive map...")
+    create_interactive_map(holes, seam_name, seam_key, counties,
+                          f'visualizations/interactive/{seam_key}-map.html',
+                          stats['thick_max'])
+    return holes, stats
+
+
 def main():
     """Generate all visualizations"""
     print("=" * 60)
@@ -601,37 +741,16 @@ def main():
 
     # Load and visualize each seam
     csv_path = 'data/csv/all-coals-study-area-combined.csv'
+    table = read_drill_hole_table(csv_path)
     all_holes = {}
     all_stats = {}
 
-    for seam_key, seam_config in SEAMS.items():
-        seam_name = seam_config['name']
-        print(f"\n{seam_name}:")
-        print("-" * 40)
-
-        # Load data
-        holes, stats = load_drill_holes(csv_path, seam_key)
+    # Seams are independent, so render them in parallel
+    results = map_with_logs(partial(process_seam, table, counties), SEAMS)
+    for seam_key, (holes, stats) in zip(SEAMS, results):
         all_holes[seam_key] = holes
         all_stats[seam_key] = stats
 
-        print(f"  Loaded {stats['valid_coords']} records")
-        print(f"  Thickness data: {stats['has_thickness']}")
-        print(f"  Depth data: {stats['has_depth']}")
-
-        # Generate static visualizations
-        print("  Generating static maps...")
-        create_thickness_map(holes, seam_name, counties,
-                            f'visualizations/static/{seam_key}-thickness-map.png')
-        create_depth_map(holes, seam_name, counties,
-                        f'visualizations/static/{seam_key}-depth-map.png')
-        create_histogram(holes, seam_name,
-                        f'visualizations/static/{seam_key}-histogram.png')
-
-        # Generate interactive map
-        print("  Generating interactive map...")
-        create_interactive_map(holes, seam_name, seam_key, counties,
-                              f'visualizations/interactive/{seam_key}-map.html')
-
     # Generate all-seams interactive map
     print("\nGenerating all-seams interactive map...")
     create_all_seams_map(all_holes, counties, 'visualizations/interactive/all-seams-map.html')